@@ -2,6 +2,13 @@ from airflow import DAG
 from airflow.operators.bash import BashOperator
 from datetime import datetime
 
+# run_results.json is overwritten by every `dbt run`, so each stage records
+# its own results before the next stage starts. The dbt exit code is kept.
+RECORD_DBT_RUN = (
+    'rc=$?; python /workspaces/churn-analytics-platform/observability/dbt_run_history.py record; '
+    'exit $rc'
+)
+
 default_args = {
     'owner': 'amr',
     'start_date': datetime(2024, 1, 1),
@@ -14,14 +21,23 @@ with DAG(
     default_args=default_args,
     schedule_interval=None,  
     catchup=False,
-    description='Complete churn analytics pipeline: staging -> intermediate -> marts -> dashboard'
+    description='Complete churn analytics pipeline: seeds -> staging -> intermediate -> marts -> dashboard'
 ) as dag:
 
+    # Seeds (zip_centroids) are refs of the marts; load them before any dbt run
+    load_seeds = BashOperator(
+        task_id='load_dbt_seeds',
+        bash_command=(
+            'cd /workspaces/churn-analytics-platform/dbt/churn_analytics && '
+            'dbt seed'
+        )
+    )
+
     run_staging = BashOperator(
         task_id='run_staging_models',
         bash_command=(
             'cd /workspaces/churn-analytics-platform/dbt/churn_analytics && '
-            'dbt run --select staging'
+            'dbt run --select staging; ' + RECORD_DBT_RUN
         )
     )
 
@@ -29,7 +45,7 @@ with DAG(
         task_id='run_intermediate_models',
         bash_command=(
             'cd /workspaces/churn-analytics-platform/dbt/churn_analytics && '
-            'dbt run --select intermediate'
+            'dbt run --select intermediate; ' + RECORD_DBT_RUN
         )
     )
 
@@ -37,13 +53,23 @@ with DAG(
         task_id='run_marts_models',
         bash_command=(
             'cd /workspaces/churn-analytics-platform/dbt/churn_analytics && '
-            'dbt run --select marts'
+            'dbt run --select marts; ' + RECORD_DBT_RUN
         )
     )
 
+    score_customers = BashOperator(
+        task_id='score_customers',
+        bash_command='python /workspaces/churn-analytics-platform/scoring/score_customers.py'
+    )
+
+    report_dbt_performance = BashOperator(
+        task_id='report_dbt_performance',
+        bash_command='python /workspaces/churn-analytics-platform/observability/dbt_run_history.py report'
+    )
+
     run_dash = BashOperator(
         task_id='run_dash_app',
         bash_command='python /workspaces/churn-analytics-platform/dash/app.py'
     )
 
-    run_staging >> run_intermediate >> run_marts >> run_dash
+    load_seeds >> run_staging >> run_intermediate >> run_marts >> score_customers >> report_dbt_performance >> run_dash
@@ -1,35 +1,96 @@
 import os
+import sys
+import threading
+import time
 import duckdb
-import pandas as pd
 from datetime import datetime
+from typing import TYPE_CHECKING
 
 import dash
 from dash import Dash, dcc, html, Input, Output, dash_table
-import plotly.express as px
+
+# pandas and plotly.express are imported inside the functions that use them,
+# so a worker can boot and serve the layout without paying for them.
+if TYPE_CHECKING:
+    import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from observability.instrumentation import log_event, register_metrics_route, span, timed_query
+from export_routes import export_href, register_export_route
 
 # -----------------------------
 # Configuration
 # -----------------------------
-DUCKDB_PATH = "/workspaces/churn-analytics-platform/duckdb/churn_warehouse.duckdb"
+DUCKDB_PATH = os.getenv("DUCKDB_PATH", "/workspaces/churn-analytics-platform/duckdb/churn_warehouse.duckdb")
+
+# "1" = warm the customer data in a background thread right after startup;
+# /ready reports 503 until it is loaded. Default ("0"): load on the first callback;
+# /ready is 200 once DuckDB is reachable, with data_loaded false until then.
+PRELOAD_DATA = os.getenv("DASH_PRELOAD_DATA", "0") == "1"
+
+# Preload retries while DuckDB is missing or locked by a writer (dbt, scoring, reloads)
+PRELOAD_RETRY_SECONDS = 5
+PRELOAD_RETRY_MAX_SECONDS = 60
+
+# Filter options used when DuckDB can't be read at boot (Telco dataset values)
+DEFAULT_CONTRACT_OPTIONS = ['Month-to-month', 'One year', 'Two year']
+DEFAULT_CHARGE_RANGE = (0, 120)
+
+# dbt writes marts to "<target schema>_marts"
+MARTS_SCHEMA = "main_marts"
+REVIEW_SEARCH_LIMIT = 50
+
+GEO_LEVELS = [
+    {'label': 'State', 'value': 'state'},
+    {'label': 'City', 'value': 'city'},
+    {'label': 'ZIP', 'value': 'zip'},
+]
+
+
+# -----------------------------
+# Read-only connections
+# -----------------------------
+def connect_read_only():
+    """New read-only connection; close it as soon as the query is done.
+
+    DuckDB lets no other process write the file while any read-only connection
+    is open, so a long-lived one would block dbt, scoring and the reloads.
+    """
+    return duckdb.connect(DUCKDB_PATH, read_only=True)
 
 
 # -----------------------------
 # Load data
 # -----------------------------
+def scores_available(con):
+    """churn_scores is written by scoring/score_customers.py and may not exist yet."""
+    return con.execute(
+        "SELECT count(*) FROM information_schema.tables WHERE table_schema = 'main' AND table_name = 'churn_scores'"
+    ).fetchone()[0] > 0
+
+
 def load_data():
+    import pandas as pd
+
     con = duckdb.connect(DUCKDB_PATH, read_only=True)
     try:
-        query = """
+        has_scores = scores_available(con)
+        score_col = "s.churn_score" if has_scores else "CAST(NULL AS DOUBLE)"
+        score_join = "LEFT JOIN churn_scores s ON c.customerID = s.customer_id" if has_scores else ""
+
+        query = f"""
             SELECT
-                customerID,
-                gender,
-                MonthlyCharges,
-                TotalCharges,
-                Contract,
-                Churn
-            FROM customer_churn_data
+                c.customerID,
+                c.gender,
+                c.MonthlyCharges,
+                c.TotalCharges,
+                c.Contract,
+                c.Churn,
+                {score_col} AS churn_score
+            FROM customer_churn_data c
+            {score_join}
         """
-        df = con.execute(query).fetch_df()
+        df = timed_query(con, query, name='load_data').fetch_df()
     finally:
         con.close()
 
@@ -49,18 +110,97 @@ def load_data():
     # Optional: fill missing numeric columns
     df['monthly_charges'] = pd.to_numeric(df['monthly_charges'], errors='coerce').fillna(0)
     df['total_charges'] = pd.to_numeric(df['total_charges'], errors='coerce').fillna(0)
+    df['churn_score'] = df['churn_score'].round(3)
 
     return df
 
-DATA = load_data()
+
+_DATA = None
+_DATA_LOCK = threading.Lock()
+
+
+def get_data():
+    """Customer frame, loaded once on first use."""
+    global _DATA
+    if _DATA is None:
+        with _DATA_LOCK:
+            if _DATA is None:
+                with span('startup', stage='load_data'):
+                    _DATA = load_data()
+    return _DATA
+
+
+def warm_up():
+    """Load the data and the plotting stack ahead of the first callback.
+
+    Retries with a growing delay while DuckDB can't be read, so a preload that
+    starts during a dbt run still completes and /ready turns 200 without traffic.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            get_filter_options()
+            get_data()
+            break
+        except Exception as e:
+            delay = min(PRELOAD_RETRY_SECONDS * attempt, PRELOAD_RETRY_MAX_SECONDS)
+            log_event("dash_preload_failed", attempt=attempt, error=str(e), retry_in_seconds=delay)
+            time.sleep(delay)
+    import plotly.express  # noqa: F401
+    log_event("dash_preload_done", attempts=attempt)
+
 
 # -----------------------------
 # Filter options
 # -----------------------------
-contract_options = sorted(DATA['contract_type'].dropna().unique())
+def load_filter_metadata():
+    """Contract options and charge bounds from the one-row dash_filter_options mart."""
+    with connect_read_only() as con:
+        try:
+            row = timed_query(con, f"""
+                SELECT contract_types, min_monthly_charges, max_monthly_charges
+                FROM {MARTS_SCHEMA}.dash_filter_options
+            """, name='filter_metadata').fetchone()
+        except duckdb.CatalogException:
+            # Marts not built yet: aggregate in DuckDB instead (still no rows reach Python)
+            row = timed_query(con, """
+                SELECT
+                    list(DISTINCT Contract ORDER BY Contract) FILTER (WHERE Contract IS NOT NULL),
+                    floor(min(TRY_CAST(MonthlyCharges AS DOUBLE))),
+                    ceil(max(TRY_CAST(MonthlyCharges AS DOUBLE)))
+                FROM customer_churn_data
+            """, name='filter_metadata').fetchone()
+    contracts, low, high = row
+    return list(contracts or []), int(low or 0), int(high or 0)
+
+
+_FILTERS = None
+_FILTERS_FAILED = False
 
-min_charge = int(DATA['monthly_charges'].min())
-max_charge = int(DATA['monthly_charges'].max())
+
+def get_filter_options():
+    """(contracts, min_charge, max_charge); defaults until DuckDB has been read once.
+
+    Never raises: a missing or write-locked warehouse must not stop a worker
+    from booting. Each call retries until a read succeeds, then it is cached.
+    """
+    global _FILTERS, _FILTERS_FAILED
+    if _FILTERS is None:
+        try:
+            with span('startup', stage='filter_metadata'):
+                _FILTERS = load_filter_metadata()
+        except duckdb.Error as e:
+            if not _FILTERS_FAILED:
+                log_event("dash_filter_metadata_unavailable", error=str(e), fallback='defaults')
+                _FILTERS_FAILED = True
+            return DEFAULT_CONTRACT_OPTIONS, *DEFAULT_CHARGE_RANGE
+        if _FILTERS_FAILED:
+            log_event("dash_filter_metadata_recovered")
+    return _FILTERS
+
+
+get_filter_options()
 
 # -----------------------------
 # Dash app setup
@@ -68,6 +208,36 @@ max_charge = int(DATA['monthly_charges'].max())
 app: Dash = dash.Dash(__name__)
 server = app.server
 
+# Prometheus scrape endpoint + per-request timing
+register_metrics_route(server)
+
+# Streaming CSV/Parquet download of the filtered customer list
+register_export_route(server, connect_read_only, scores_available)
+
+
+@server.route('/ready')
+def ready():
+    """Readiness probe: DuckDB readable, filter options loaded and (with preload) data warmed."""
+    from flask import jsonify
+
+    get_filter_options()  # picks up real options once the warehouse is readable again
+    try:
+        with connect_read_only() as con:
+            con.execute("SELECT 1").fetchone()
+        database = True
+    except duckdb.Error:
+        database = False
+    filters_loaded = _FILTERS is not None
+    data_loaded = _DATA is not None
+    is_ready = database and filters_loaded and (data_loaded or not PRELOAD_DATA)
+    return jsonify(
+        ready=is_ready, database=database, filters_loaded=filters_loaded, data_loaded=data_loaded
+    ), 200 if is_ready else 503
+
+
+if PRELOAD_DATA:
+    threading.Thread(target=warm_up, name='dash-warm-up', daemon=True).start()
+
 card_style = {
     'padding': '12px 16px',
     'border': '1px solid #e5e7eb',
@@ -76,94 +246,156 @@ card_style = {
     'boxShadow': '0 1px 2px rgba(0,0,0,0.05)'
 }
 
-app.layout = html.Div(
-    style={'fontFamily': 'Segoe UI, Arial', 'background': '#f8fafc', 'minHeight': '100vh', 'padding': '16px'},
-    children=[
-        html.Div([
-            html.H2('Customer Churn Dashboard', style={'margin': 0}),
-            html.Div('Understand why customers leave and how to retain them', style={'color': '#64748b'})
-        ], style={'marginBottom': '16px'}),
-
-        # Filters
-        html.Div([
+def serve_layout():
+    # Called per page load, so filter options fall back to defaults only until DuckDB is readable
+    contract_options, min_charge, max_charge = get_filter_options()
+    return html.Div(
+        style={'fontFamily': 'Segoe UI, Arial', 'background': '#f8fafc', 'minHeight': '100vh', 'padding': '16px'},
+        children=[
             html.Div([
-                html.Label('Contract Type'),
-                dcc.Dropdown(
-                    id='filter-contract',
-                    options=[{'label': c, 'value': c} for c in contract_options],
-                    value=contract_options,
-                    multi=True,
-                    placeholder='Select contract types'
-                )
-            ], style={'flex': 1, 'minWidth': '220px'}),
+                html.H2('Customer Churn Dashboard', style={'margin': 0}),
+                html.Div('Understand why customers leave and how to retain them', style={'color': '#64748b'})
+            ], style={'marginBottom': '16px'}),
+
+            # Filters
             html.Div([
-                html.Label('Monthly Charges'),
-                dcc.RangeSlider(
-                    id='filter-monthly-charges',
-                    min=min_charge,
-                    max=max_charge,
-                    value=[min_charge, max_charge],
-                    tooltip={'placement': 'bottom', 'always_visible': False}
-                )
-            ], style={'flex': 2, 'minWidth': '260px', 'padding': '0 12px'}),
+                html.Div([
+                    html.Label('Contract Type'),
+                    dcc.Dropdown(
+                        id='filter-contract',
+                        options=[{'label': c, 'value': c} for c in contract_options],
+                        value=contract_options,
+                        multi=True,
+                        placeholder='Select contract types'
+                    )
+                ], style={'flex': 1, 'minWidth': '220px'}),
+                html.Div([
+                    html.Label('Monthly Charges'),
+                    dcc.RangeSlider(
+                        id='filter-monthly-charges',
+                        min=min_charge,
+                        max=max_charge,
+                        value=[min_charge, max_charge],
+                        tooltip={'placement': 'bottom', 'always_visible': False}
+                    )
+                ], style={'flex': 2, 'minWidth': '260px', 'padding': '0 12px'}),
+                html.Div([
+                    html.Label('Churn Score (active customers)'),
+                    dcc.RangeSlider(
+                        id='filter-churn-score',
+                        min=0,
+                        max=1,
+                        step=0.05,
+                        value=[0, 1],
+                        marks={0: '0', 0.3: '0.3', 0.6: '0.6', 1: '1'},
+                        tooltip={'placement': 'bottom', 'always_visible': False}
+                    )
+                ], style={'flex': 2, 'minWidth': '220px', 'padding': '0 12px'}),
+                html.Div([
+                    html.Label('Status'),
+                    dcc.Checklist(
+                        id='filter-churn',
+                        options=[{'label': 'Active', 'value': 0}, {'label': 'Churned', 'value': 1}],
+                        value=[0, 1],
+                        inline=True
+                    )
+                ], style={'flex': 1, 'minWidth': '220px'})
+            ], style={'display': 'flex', 'gap': '12px', 'marginBottom': '16px'}),
+
+            # KPIs
             html.Div([
-                html.Label('Status'),
-                dcc.Checklist(
-                    id='filter-churn',
-                    options=[{'label': 'Active', 'value': 0}, {'label': 'Churned', 'value': 1}],
-                    value=[0, 1],
-                    inline=True
-                )
-            ], style={'flex': 1, 'minWidth': '220px'})
-        ], style={'display': 'flex', 'gap': '12px', 'marginBottom': '16px'}),
+                html.Div([
+                    html.Div('Total Customers', style={'color': '#64748b'}),
+                    html.H3(id='kpi-total', style={'margin': 0})
+                ], style=card_style),
+                html.Div([
+                    html.Div('Churned Customers', style={'color': '#64748b'}),
+                    html.H3(id='kpi-churned', style={'margin': 0})
+                ], style=card_style),
+                html.Div([
+                    html.Div('Churn Rate', style={'color': '#64748b'}),
+                    html.H3(id='kpi-churn-rate', style={'margin': 0})
+                ], style=card_style),
+                html.Div([
+                    html.Div('Avg Monthly Charges', style={'color': '#64748b'}),
+                    html.H3(id='kpi-avg-rev-lost', style={'margin': 0})
+                ], style=card_style),
+            ], style={'display': 'grid', 'gridTemplateColumns': 'repeat(4, 1fr)', 'gap': '12px', 'marginBottom': '16px'}),
 
-        # KPIs
-        html.Div([
+            # Charts
             html.Div([
-                html.Div('Total Customers', style={'color': '#64748b'}),
-                html.H3(id='kpi-total', style={'margin': 0})
-            ], style=card_style),
+                html.Div([dcc.Graph(id='fig-churn-pie', config={'displayModeBar': False})], style=card_style),
+                html.Div([dcc.Graph(id='fig-churn-contract', config={'displayModeBar': False})], style=card_style),
+            ], style={'display': 'grid', 'gridTemplateColumns': 'repeat(2, 1fr)', 'gap': '12px', 'marginBottom': '16px'}),
+
+            # Geography (reads the precomputed agg_churn_geography rollup only)
             html.Div([
-                html.Div('Churned Customers', style={'color': '#64748b'}),
-                html.H3(id='kpi-churned', style={'margin': 0})
-            ], style=card_style),
+                html.Div([
+                    html.H4('Churn by geography (all customers)', style={'margin': 0}),
+                    dcc.RadioItems(
+                        id='geo-level',
+                        options=GEO_LEVELS,
+                        value='state',
+                        inline=True
+                    )
+                ], style={'display': 'flex', 'justifyContent': 'space-between', 'alignItems': 'center'}),
+                dcc.Graph(id='fig-geo-map', config={'displayModeBar': False})
+            ], style={**card_style, 'marginBottom': '16px'}),
+
+            # Table
             html.Div([
-                html.Div('Churn Rate', style={'color': '#64748b'}),
-                html.H3(id='kpi-churn-rate', style={'margin': 0})
+                html.Div([
+                    html.H4('Customer details', style={'margin': 0}),
+                    html.Div([
+                        html.A('Download CSV', id='export-csv', href='', download='customers.csv'),
+                        html.A('Download Parquet', id='export-parquet', href='', download='customers.parquet')
+                    ], style={'display': 'flex', 'gap': '12px'})
+                ], style={'display': 'flex', 'justifyContent': 'space-between', 'alignItems': 'center',
+                          'marginBottom': '8px'}),
+                dash_table.DataTable(
+                    id='detail-table',
+                    columns=[{"name": c, "id": c} for c in [
+                        'customer_id', 'churn_label', 'churn_score', 'monthly_charges', 'total_charges', 'contract_type', 'gender'
+                    ]],
+                    page_size=10,
+                    style_table={'overflowX': 'auto'},
+                    sort_action='native',
+                    filter_action='native'
+                )
             ], style=card_style),
+
+            # Review search (backed by the full-text index on fact_review)
             html.Div([
-                html.Div('Avg Monthly Charges', style={'color': '#64748b'}),
-                html.H3(id='kpi-avg-rev-lost', style={'margin': 0})
-            ], style=card_style),
-        ], style={'display': 'grid', 'gridTemplateColumns': 'repeat(4, 1fr)', 'gap': '12px', 'marginBottom': '16px'}),
-
-        # Charts
-        html.Div([
-            html.Div([dcc.Graph(id='fig-churn-pie', config={'displayModeBar': False})], style=card_style),
-            html.Div([dcc.Graph(id='fig-churn-contract', config={'displayModeBar': False})], style=card_style),
-        ], style={'display': 'grid', 'gridTemplateColumns': 'repeat(2, 1fr)', 'gap': '12px', 'marginBottom': '16px'}),
-
-        # Table
-        html.Div([
-            html.H4('Customer details'),
-            dash_table.DataTable(
-                id='detail-table',
-                columns=[{"name": c, "id": c} for c in [
-                    'customer_id', 'churn_label', 'monthly_charges', 'total_charges', 'contract_type', 'gender'
-                ]],
-                page_size=10,
-                style_table={'overflowX': 'auto'},
-                sort_action='native',
-                filter_action='native'
-            )
-        ], style=card_style)
-    ]
-)
+                html.H4('Search customer reviews'),
+                dcc.Input(
+                    id='review-search',
+                    type='search',
+                    placeholder='e.g. slow internet, billing, support',
+                    debounce=True,
+                    style={'width': '100%', 'padding': '8px', 'marginBottom': '8px'}
+                ),
+                html.Div(id='review-search-status', style={'color': '#64748b', 'marginBottom': '8px'}),
+                dash_table.DataTable(
+                    id='review-results',
+                    columns=[{"name": c, "id": c} for c in [
+                        'customer_id', 'churn_label', 'review_date', 'rating', 'sentiment', 'review_text', 'score'
+                    ]],
+                    page_size=10,
+                    style_table={'overflowX': 'auto'},
+                    style_cell={'textAlign': 'left', 'whiteSpace': 'normal'},
+                    sort_action='native'
+                )
+            ], style={**card_style, 'marginTop': '16px'})
+        ]
+    )
+
+
+app.layout = serve_layout
 
 # -----------------------------
 # Callbacks
 # -----------------------------
-def apply_filters(df: pd.DataFrame, contracts, monthly_range, churn_vals):
+def apply_filters(df: "pd.DataFrame", contracts, monthly_range, churn_vals, score_range=None):
     f = df.copy()
     if contracts and len(contracts):
         f = f[f['contract_type'].isin(contracts)]
@@ -171,6 +403,9 @@ def apply_filters(df: pd.DataFrame, contracts, monthly_range, churn_vals):
         f = f[(f['monthly_charges'] >= monthly_range[0]) & (f['monthly_charges'] <= monthly_range[1])]
     if churn_vals is not None and len(churn_vals):
         f = f[f['churn'].isin(churn_vals)]
+    # Only churned customers have no score; a narrowed range keeps scored (active) customers only
+    if score_range and len(score_range) == 2 and list(score_range) != [0, 1]:
+        f = f[f['churn_score'].between(score_range[0], score_range[1])]
     return f
 
 @app.callback(
@@ -186,35 +421,53 @@ def apply_filters(df: pd.DataFrame, contracts, monthly_range, churn_vals):
     [
         Input('filter-contract', 'value'),
         Input('filter-monthly-charges', 'value'),
-        Input('filter-churn', 'value')
+        Input('filter-churn', 'value'),
+        Input('filter-churn-score', 'value')
     ]
 )
-def update_dashboard(contracts, monthly_range, churn_vals):
-    df = apply_filters(DATA, contracts, monthly_range, churn_vals)
-
-    # KPIs
-    total_customers = len(df)
-    churned_customers = int(df['churn'].sum())
-    churn_rate = (churned_customers / total_customers * 100) if total_customers else 0
-    avg_monthly = df.loc[df['churn'] == 1, 'monthly_charges'].mean() if churned_customers else 0
-
-    # Pie chart
-    pie_df = df['churn_label'].value_counts().reset_index()
-    pie_df.columns = ['churn_label', 'count']
-    fig_pie = px.pie(pie_df, names='churn_label', values='count', color='churn_label',
-                     color_discrete_map={'Active':'#22c55e','Churned':'#ef4444'},
-                     title='Churn vs Active')
-    fig_pie.update_traces(textposition='inside', textinfo='percent+label', hole=0.35)
-
-    # Contract churn rate
-    contract_df = df.groupby('contract_type').agg(total=('customer_id','count'), churned=('churn','sum')).reset_index()
-    contract_df['churn_rate'] = (contract_df['churned']/contract_df['total']*100).round(2)
-    fig_contract = px.bar(contract_df, x='contract_type', y='churn_rate', title='Churn rate by contract',
-                          color='churn_rate', color_continuous_scale='Reds')
-
-    # Table data
-    table_cols = ['customer_id','churn_label','monthly_charges','total_charges','contract_type','gender']
-    detail_data = df[table_cols].to_dict('records') if len(df) else []
+def update_dashboard(contracts, monthly_range, churn_vals, score_range):
+    with span('dash_callback', callback='update_dashboard'):
+        return _update_dashboard(contracts, monthly_range, churn_vals, score_range)
+
+
+def _phase(name):
+    return span('dash_callback_phase', callback='update_dashboard', phase=name)
+
+
+def _update_dashboard(contracts, monthly_range, churn_vals, score_range):
+    import plotly.express as px
+
+    with _phase('filter'):
+        df = apply_filters(get_data(), contracts, monthly_range, churn_vals, score_range)
+
+    with _phase('aggregate'):
+        # KPIs
+        total_customers = len(df)
+        churned_customers = int(df['churn'].sum())
+        churn_rate = (churned_customers / total_customers * 100) if total_customers else 0
+        avg_monthly = df.loc[df['churn'] == 1, 'monthly_charges'].mean() if churned_customers else 0
+
+        pie_df = df['churn_label'].value_counts().reset_index()
+        pie_df.columns = ['churn_label', 'count']
+
+        contract_df = df.groupby('contract_type').agg(total=('customer_id','count'), churned=('churn','sum')).reset_index()
+        contract_df['churn_rate'] = (contract_df['churned']/contract_df['total']*100).round(2)
+
+    with _phase('figure'):
+        # Pie chart
+        fig_pie = px.pie(pie_df, names='churn_label', values='count', color='churn_label',
+                         color_discrete_map={'Active':'#22c55e','Churned':'#ef4444'},
+                         title='Churn vs Active')
+        fig_pie.update_traces(textposition='inside', textinfo='percent+label', hole=0.35)
+
+        # Contract churn rate
+        fig_contract = px.bar(contract_df, x='contract_type', y='churn_rate', title='Churn rate by contract',
+                              color='churn_rate', color_continuous_scale='Reds')
+
+    with _phase('serialize'):
+        # Table data
+        table_cols = ['customer_id','churn_label','churn_score','monthly_charges','total_charges','contract_type','gender']
+        detail_data = df[table_cols].to_dict('records') if len(df) else []
 
     return (
         f"{total_customers:,}",
@@ -226,6 +479,124 @@ def update_dashboard(contracts, monthly_range, churn_vals):
         detail_data
     )
 
+@app.callback(
+    [
+        Output('export-csv', 'href'),
+        Output('export-parquet', 'href')
+    ],
+    [
+        Input('filter-contract', 'value'),
+        Input('filter-monthly-charges', 'value'),
+        Input('filter-churn', 'value'),
+        Input('filter-churn-score', 'value')
+    ]
+)
+def update_export_links(contracts, monthly_range, churn_vals, score_range):
+    # Only builds URLs; the rows are streamed by the export route, not by a callback
+    return (
+        export_href('csv', contracts, monthly_range, churn_vals, score_range),
+        export_href('parquet', contracts, monthly_range, churn_vals, score_range)
+    )
+
+
+def load_geo_rollup(level):
+    query = f"""
+        SELECT *
+        FROM {MARTS_SCHEMA}.agg_churn_geography
+        WHERE geo_level = ?
+    """
+    with connect_read_only() as con:
+        return timed_query(con, query, [level], name='geo_rollup').fetch_df()
+
+
+def _empty_geo_figure(message):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Scattergeo())
+    fig.update_geos(scope='usa')
+    fig.update_layout(title=message, margin={'l': 0, 'r': 0, 't': 30, 'b': 0})
+    return fig
+
+
+@app.callback(
+    Output('fig-geo-map', 'figure'),
+    Input('geo-level', 'value')
+)
+def update_geo_map(level):
+    import plotly.express as px
+
+    with span('dash_callback', callback='update_geo_map'):
+        try:
+            geo = load_geo_rollup(level)
+        except duckdb.CatalogException:
+            return _empty_geo_figure('No geography rollup yet - run dbt to build agg_churn_geography')
+        except duckdb.Error as e:
+            return _empty_geo_figure(f'Could not load the geography rollup: {e}')
+        hover = ['customers', 'churned_customers', 'lost_monthly_revenue', 'churn_per_1k_population']
+
+        if level == 'state':
+            # State codes are enough for a choropleth - no coordinates needed
+            fig = px.choropleth(geo, locations='state_code', locationmode='USA-states', scope='usa',
+                                color='churn_rate_pct', color_continuous_scale='Reds',
+                                hover_name='state_name', hover_data=hover)
+        else:
+            points = geo.dropna(subset=['centroid_lat', 'centroid_lon'])
+            fig = px.scatter_geo(points, lat='centroid_lat', lon='centroid_lon', scope='usa',
+                                 size='customers', color='churn_rate_pct', color_continuous_scale='Reds',
+                                 hover_name='geo_key', hover_data=hover)
+            fig.update_geos(fitbounds='locations' if len(points) else False)
+            if points.empty:
+                fig.update_layout(title='No centroids for these zip codes - add them to dbt seeds/zip_centroids.csv')
+
+        fig.update_layout(margin={'l': 0, 'r': 0, 't': 30, 'b': 0})
+        return fig
+
+
+def search_reviews(terms, limit=REVIEW_SEARCH_LIMIT):
+    """BM25 keyword search over review text, best matches first."""
+    query = f"""
+        SELECT
+            r.customer_id,
+            CASE WHEN c.has_churned THEN 'Churned' ELSE 'Active' END AS churn_label,
+            CAST(r.review_date AS VARCHAR) AS review_date,
+            r.rating,
+            r.sentiment,
+            r.review_text,
+            ROUND(r.score, 3) AS score
+        FROM (
+            SELECT *, fts_{MARTS_SCHEMA}_fact_review.match_bm25(review_id, ?) AS score
+            FROM {MARTS_SCHEMA}.fact_review
+        ) r
+        LEFT JOIN {MARTS_SCHEMA}.dim_customer c ON r.customer_sk = c.customer_sk
+        WHERE r.score IS NOT NULL
+        ORDER BY r.score DESC
+        LIMIT ?
+    """
+    with connect_read_only() as con:
+        # fts is installed by the fact_review dbt hook; only review search needs it
+        con.execute("LOAD fts")
+        return timed_query(con, query, [terms, limit], name='review_search').fetch_df()
+
+
+@app.callback(
+    [
+        Output('review-results', 'data'),
+        Output('review-search-status', 'children')
+    ],
+    Input('review-search', 'value')
+)
+def update_review_search(terms):
+    if not terms or not terms.strip():
+        return [], ''
+    with span('dash_callback', callback='update_review_search'):
+        try:
+            results = search_reviews(terms.strip())
+        except duckdb.CatalogException:
+            return [], 'Review search is not available yet - run dbt to build fact_review.'
+        except duckdb.Error as e:
+            return [], f'Review search failed: {e}'
+        return results.to_dict('records'), f'{len(results)} matching reviews'
+
 # -----------------------------
 # Run app
 # -----------------------------
@@ -0,0 +1,85 @@
+"""
+Startup-time benchmark for the Dash app.
+
+Each run spawns a fresh interpreter (like a gunicorn worker boot) and measures:
+  - import:       `import app` - layout built, routes registered
+  - ready:        import + first 200 from /ready
+  - first_update: import + the first update_dashboard call (cold data load)
+
+A run fails (instead of hanging) when /ready is not 200 within --timeout seconds.
+
+Usage (from dash/):
+    python benchmark_startup.py --runs 5
+    DASH_PRELOAD_DATA=1 python benchmark_startup.py --timeout 30
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Runs inside the child interpreter; prints one JSON line of timings (ms)
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+deadline = t0 + float(sys.argv[1])
+import app
+t_import = time.perf_counter()
+
+client = app.server.test_client()
+while True:
+    response = client.get('/ready')
+    if response.status_code == 200:
+        break
+    if time.perf_counter() > deadline:
+        sys.exit(f"/ready not 200 within {sys.argv[1]}s: {response.get_json()}")
+    time.sleep(0.005)
+t_ready = time.perf_counter()
+
+contracts, min_charge, max_charge = app.get_filter_options()
+app.update_dashboard(contracts, [min_charge, max_charge], [0, 1], [0, 1])
+t_update = time.perf_counter()
+
+ms = lambda t: round((t - t0) * 1000, 1)
+print(json.dumps({'import': ms(t_import), 'ready': ms(t_ready), 'first_update': ms(t_update)}))
+"""
+
+
+def run_once(timeout):
+    try:
+        result = subprocess.run(
+            [sys.executable, "-c", CHILD, str(timeout)], cwd=HERE, env=os.environ.copy(),
+            capture_output=True, text=True, timeout=timeout * 2,
+        )
+    except subprocess.TimeoutExpired:
+        raise SystemExit(f"❌ Worker did not finish within {timeout * 2}s")
+    if result.returncode != 0:
+        raise SystemExit(f"❌ Worker failed:\n{result.stderr.strip()}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure Dash worker start-up time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60, help="seconds to wait for /ready")
+    args = parser.parse_args(argv)
+
+    mode = "preload" if os.getenv("DASH_PRELOAD_DATA", "0") == "1" else "lazy"
+    print(f"⏱️  Dash start-up benchmark ({args.runs} runs, mode: {mode})\n")
+
+    results = [run_once(args.timeout) for _ in range(args.runs)]
+
+    print(f"  {'stage':14s} {'median':>10s} {'min':>10s} {'max':>10s}")
+    summary = {}
+    for stage in ('import', 'ready', 'first_update'):
+        values = [r[stage] for r in results]
+        summary[stage] = statistics.median(values)
+        print(f"  {stage:14s} {summary[stage]:8.1f}ms {min(values):8.1f}ms {max(values):8.1f}ms")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+import io
+from urllib.parse import urlencode
+
+from flask import Response, abort, request
+
+from observability.instrumentation import inc, timed_query
+
+# -----------------------------
+# Configuration
+# -----------------------------
+EXPORT_PATH = "/export/customers"
+EXPORT_BATCH_ROWS = 50_000
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+# -----------------------------
+# Filter state <-> query string
+# -----------------------------
+def export_href(fmt, contracts, monthly_range, churn_vals, score_range):
+    """Download link carrying the same filter state as update_dashboard."""
+    params = [('format', fmt)]
+    params += [('contract', c) for c in contracts or []]
+    if monthly_range and len(monthly_range) == 2:
+        params += [('min_charge', monthly_range[0]), ('max_charge', monthly_range[1])]
+    params += [('status', v) for v in churn_vals or []]
+    if score_range and len(score_range) == 2 and list(score_range) != [0, 1]:
+        params += [('min_score', score_range[0]), ('max_score', score_range[1])]
+    return f"{EXPORT_PATH}?{urlencode(params)}"
+
+
+def _range(args, low, high):
+    if low in args and high in args:
+        return [float(args[low]), float(args[high])]
+    return None
+
+
+def parse_filters(args):
+    try:
+        return (
+            args.getlist('contract'),
+            _range(args, 'min_charge', 'max_charge'),
+            [int(v) for v in args.getlist('status')],
+            _range(args, 'min_score', 'max_score'),
+        )
+    except ValueError:
+        abort(400, "invalid filter value")
+
+
+# -----------------------------
+# Query (same filters as apply_filters, pushed down to DuckDB)
+# -----------------------------
+def build_export_query(contracts, monthly_range, churn_vals, score_range, has_scores):
+    score_col = "s.churn_score" if has_scores else "CAST(NULL AS DOUBLE)"
+    score_join = "LEFT JOIN churn_scores s ON c.customerID = s.customer_id" if has_scores else ""
+
+    where, params = [], []
+    if contracts:
+        where.append("list_contains(?, contract_type)")
+        params.append(list(contracts))
+    if monthly_range:
+        where.append("monthly_charges BETWEEN ? AND ?")
+        params += monthly_range
+    if churn_vals:
+        where.append("list_contains(?, churn)")
+        params.append(list(churn_vals))
+    if score_range:
+        where.append("churn_score BETWEEN ? AND ?")
+        params += score_range
+
+    query = f"""
+        WITH customers AS (
+            SELECT
+                c.customerID AS customer_id,
+                CASE c.Churn WHEN 'Yes' THEN 1 WHEN 'No' THEN 0 END AS churn,
+                round({score_col}, 3) AS churn_score,
+                coalesce(TRY_CAST(c.MonthlyCharges AS DOUBLE), 0) AS monthly_charges,
+                coalesce(TRY_CAST(trim(CAST(c.TotalCharges AS VARCHAR)) AS DOUBLE), 0) AS total_charges,
+                c.Contract AS contract_type,
+                c.gender
+            FROM customer_churn_data c
+            {score_join}
+        )
+        SELECT
+            customer_id,
+            CASE churn WHEN 1 THEN 'Churned' WHEN 0 THEN 'Active' END AS churn_label,
+            churn_score,
+            monthly_charges,
+            total_charges,
+            contract_type,
+            gender
+        FROM customers
+        {"WHERE " + " AND ".join(where) if where else ""}
+    """
+    return query, params
+
+
+# -----------------------------
+# Chunked writers
+# -----------------------------
+# pyarrow is imported on first export, keeping it out of worker start-up
+def stream_csv(reader):
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    header = True
+    for batch in reader:
+        buf = io.BytesIO()
+        pacsv.write_csv(pa.Table.from_batches([batch]), buf,
+                        write_options=pacsv.WriteOptions(include_header=header))
+        header = False
+        yield buf.getvalue()
+    if header:
+        # No matching rows: still send the header line
+        buf = io.BytesIO()
+        pacsv.write_csv(reader.schema.empty_table(), buf)
+        yield buf.getvalue()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only sink the Parquet writer fills; drained after every row group."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_parquet(reader):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+    with pq.ParquetWriter(pa.PythonFile(sink, mode='w'), reader.schema) as writer:
+        for batch in reader:
+            # One row group per batch, sent as soon as it is written
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+# -----------------------------
+# Route
+# -----------------------------
+def register_export_route(server, connect, scores_available):
+    """Stream filtered customers from DuckDB as CSV or Parquet, batch by batch.
+
+    Rows never collect in Python: DuckDB hands over Arrow record batches of
+    EXPORT_BATCH_ROWS, each encoded and flushed to the client before the next
+    one is fetched. Runs in the request thread, not a Dash callback.
+    `connect()` opens a read-only connection that is closed when the response
+    ends, so the file is only locked while an export is streaming.
+    """
+
+    @server.route(EXPORT_PATH)
+    def export_customers():
+        fmt = request.args.get('format', 'csv')
+        if fmt not in EXPORT_FORMATS:
+            abort(400, f"format must be one of {sorted(EXPORT_FORMATS)}")
+        filters = parse_filters(request.args)
+
+        con = connect()
+        try:
+            query, params = build_export_query(*filters, has_scores=scores_available(con))
+            reader = timed_query(con, query, params, name='export_customers').fetch_record_batch(EXPORT_BATCH_ROWS)
+        except Exception:
+            con.close()
+            raise
+        inc("export_requests", format=fmt)
+
+        def generate():
+            try:
+                yield from (stream_csv(reader) if fmt == 'csv' else stream_parquet(reader))
+            finally:
+                con.close()
+
+        return Response(
+            generate(),
+            mimetype=EXPORT_FORMATS[fmt],
+            headers={'Content-Disposition': f'attachment; filename=customers.{fmt}'},
+        )
+
+    return server
@@ -0,0 +1,95 @@
+{{
+    config(
+        materialized='table',
+        tags=['marts', 'agg', 'geography']
+    )
+}}
+
+-- Churn rollups at zip, city and state level (one row per geo_level + geo_key).
+-- The dashboard map reads only this table, never customer-grain rows.
+
+with customers as (
+    select * from {{ ref('int_customer_with_location') }}
+    where zip_code is not null
+),
+
+zips as (
+    select zip_code, state_code from {{ ref('stg_zip_population') }}
+),
+
+by_zip as (
+    select
+        c.zip_code,
+        any_value(c.city) as city,
+        any_value(c.state_name) as state_name,
+        any_value(z.state_code) as state_code,
+        count(*) as customers,
+        count(*) filter (where c.has_churned) as churned_customers,
+        coalesce(sum(c.monthly_charges) filter (where c.has_churned), 0) as lost_monthly_revenue,
+        max(c.area_population) as population
+    from customers c
+    left join zips z on c.zip_code = z.zip_code
+    group by c.zip_code
+),
+
+rollups as (
+    select
+        'zip' as geo_level,
+        cast(zip_code as varchar) as geo_key,
+        state_name, state_code, city, zip_code,
+        customers, churned_customers, lost_monthly_revenue, population
+    from by_zip
+
+    union all
+
+    select
+        'city' as geo_level,
+        state_name || '|' || city as geo_key,
+        state_name, any_value(state_code), city, null,
+        sum(customers), sum(churned_customers), sum(lost_monthly_revenue), sum(population)
+    from by_zip
+    group by state_name, city
+
+    union all
+
+    select
+        'state' as geo_level,
+        state_name as geo_key,
+        state_name, any_value(state_code), null, null,
+        sum(customers), sum(churned_customers), sum(lost_monthly_revenue), sum(population)
+    from by_zip
+    group by state_name
+)
+
+select
+    r.geo_level,
+    r.geo_key,
+    r.state_name,
+    r.state_code,
+    r.city,
+    r.zip_code,
+
+    -- Counts (sum() over the union widens count(*) to HUGEINT; cast back)
+    cast(r.customers as bigint) as customers,
+    cast(r.churned_customers as bigint) as churned_customers,
+    round(r.churned_customers * 100.0 / r.customers, 2) as churn_rate_pct,
+
+    -- Revenue
+    round(r.lost_monthly_revenue, 2) as lost_monthly_revenue,
+    round(r.lost_monthly_revenue * 12, 2) as estimated_annual_revenue_loss,
+
+    -- Population (sum of the zip-code populations the customers live in)
+    cast(r.population as bigint) as area_population,
+    round(r.churned_customers * 1000.0 / nullif(r.population, 0), 4) as churn_per_1k_population,
+
+    -- Map placement
+    b.centroid_lat,
+    b.centroid_lon,
+    b.min_lat,
+    b.max_lat,
+    b.min_lon,
+    b.max_lon
+
+from rollups r
+left join {{ ref('dim_geo_bounds') }} b
+    on r.geo_level = b.geo_level and r.geo_key = b.geo_key
@@ -0,0 +1,41 @@
+{{
+    config(
+        materialized='table',
+        tags=['marts', 'agg', 'reviews']
+    )
+}}
+
+-- One row per reviewing customer, joinable to dim_customer on customer_sk
+
+with reviews as (
+    select * from {{ ref('stg_customer_reviews') }}
+)
+
+select
+    customer_id,
+    {{ generate_int_surrogate_key(['customer_id']) }} as customer_sk,
+
+    -- Volume
+    count(*) as review_count,
+    min(review_date) as first_review_date,
+    max(review_date) as latest_review_date,
+
+    -- Latest review
+    arg_max(review_text, review_date) as latest_review_text,
+    arg_max(rating, review_date) as latest_rating,
+
+    -- Rating stats
+    round(avg(rating), 2) as avg_rating,
+    min(rating) as min_rating,
+    max(rating) as max_rating,
+
+    -- Sentiment stats
+    count(*) filter (where sentiment = 'Positive') as positive_reviews,
+    count(*) filter (where sentiment = 'Negative') as negative_reviews,
+    round(
+        count(*) filter (where sentiment = 'Negative') * 100.0 / count(*),
+        2
+    ) as negative_review_pct
+
+from reviews
+group by customer_id
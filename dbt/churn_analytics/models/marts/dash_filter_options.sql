@@ -0,0 +1,18 @@
+{{
+    config(
+        materialized='table',
+        tags=['marts', 'dash']
+    )
+}}
+
+-- Single-row metadata for the dashboard filters, so the Dash layout can be
+-- built at worker start without reading customer-grain rows.
+
+select
+    list(distinct contract_type order by contract_type)
+        filter (where contract_type is not null) as contract_types,
+    floor(min(monthly_charges)) as min_monthly_charges,
+    ceil(max(monthly_charges)) as max_monthly_charges,
+    count(*) as customers,
+    current_timestamp as dbt_updated_at
+from {{ ref('stg_customer_churn') }}
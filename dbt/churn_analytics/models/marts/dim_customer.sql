@@ -13,6 +13,6 @@ select
     has_churned, 
     
     -- مفتاح بديل (Surrogate Key)
-    {{ dbt_utils.generate_surrogate_key(['customer_id']) }} as customer_sk
+    {{ generate_int_surrogate_key(['customer_id']) }} as customer_sk
 
 from {{ ref('int_customer_metrics') }}
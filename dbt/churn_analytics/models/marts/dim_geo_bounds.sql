@@ -0,0 +1,47 @@
+{{
+    config(
+        materialized='table',
+        tags=['marts', 'dim', 'geography']
+    )
+}}
+
+-- Centroid + bounding box per zip / city / state, from the zip_centroids seed.
+-- City and state centroids are population-weighted over their zip codes.
+
+with zips as (
+    select distinct
+        g.zip_code,
+        g.city,
+        g.state_name,
+        coalesce(g.area_population, 0) as population,
+        c.latitude,
+        c.longitude
+    from {{ ref('dim_geography') }} g
+    inner join {{ ref('zip_centroids') }} c on g.zip_code = c.zip_code
+),
+
+levels as (
+    select 'zip' as geo_level, cast(zip_code as varchar) as geo_key, * from zips
+    union all
+    select 'city' as geo_level, state_name || '|' || city as geo_key, * from zips
+    union all
+    select 'state' as geo_level, state_name as geo_key, * from zips
+)
+
+select
+    geo_level,
+    geo_key,
+    coalesce(
+        sum(latitude * population) / nullif(sum(population), 0),
+        avg(latitude)
+    ) as centroid_lat,
+    coalesce(
+        sum(longitude * population) / nullif(sum(population), 0),
+        avg(longitude)
+    ) as centroid_lon,
+    min(latitude) as min_lat,
+    max(latitude) as max_lat,
+    min(longitude) as min_lon,
+    max(longitude) as max_lon
+from levels
+group by geo_level, geo_key
@@ -15,7 +15,7 @@ select distinct
     area_population,
     
     -- مفتاح بديل (Surrogate Key)
-    {{ dbt_utils.generate_surrogate_key(['zip_code']) }} as geography_sk 
+    {{ generate_int_surrogate_key(['zip_code']) }} as geography_sk 
 
 from {{ ref('int_customer_with_location') }}
 where zip_code is not null
@@ -16,7 +16,7 @@ select distinct
     streaming_movies,
     
     -- مفتاح بديل (Surrogate Key)
-    {{ dbt_utils.generate_surrogate_key([
+    {{ generate_int_surrogate_key([
         'contract_type', 
         'internet_service', 
         'has_phone_service',
@@ -15,12 +15,12 @@ location as (
 
 select
     -- المفاتيح البديلة (Surrogate Keys)
-    {{ dbt_utils.generate_surrogate_key(['m.customer_id']) }} as customer_sk,
+    {{ generate_int_surrogate_key(['m.customer_id']) }} as customer_sk,
     
-    {{ dbt_utils.generate_surrogate_key(['l.zip_code']) }} as geography_sk,
+    {{ generate_int_surrogate_key(['l.zip_code']) }} as geography_sk,
     
     -- المفتاح موحد الآن ليشمل جميع أعمدة الخدمات لضمان التكامل مع dim_service
-    {{ dbt_utils.generate_surrogate_key([
+    {{ generate_int_surrogate_key([
         'm.contract_type', 
         'm.internet_service', 
         'm.has_phone_service',
@@ -0,0 +1,29 @@
+{{
+    config(
+        materialized='table',
+        tags=['marts', 'fact', 'reviews'],
+        post_hook=[
+            "install fts",
+            "load fts",
+            "pragma create_fts_index('{{ this.schema }}.{{ this.identifier }}', 'review_id', 'review_text', stemmer='porter', stopwords='english', overwrite=1)"
+        ]
+    )
+}}
+
+-- Review-grain fact with a full-text (BM25) index over review_text.
+-- Search with: fts_<schema>_fact_review.match_bm25(review_id, 'keywords')
+
+select
+    review_id,
+    customer_id,
+
+    -- مفتاح بديل (Surrogate Key) - يربط مع dim_customer
+    {{ generate_int_surrogate_key(['customer_id']) }} as customer_sk,
+
+    review_date,
+    rating,
+    sentiment,
+    review_text
+
+from {{ ref('stg_customer_reviews') }}
+where review_text is not null
@@ -5,7 +5,32 @@
     )
 }}
 
+with source_data as (
+    select
+        *,
+        -- Numbers exact duplicates so they still get distinct ids
+        row_number() over (partition by customer_id, review_date, comment) as duplicate_seq
+    from {{ source('churn_raw', 'customer_reviews') }}
+)
+
 select
-    *,
+    -- Integer id hashed from the review itself (document id of the full-text index);
+    -- unchanged when other reviews are added or removed
+    {{ generate_int_surrogate_key(['customer_id', 'review_date', 'comment', 'duplicate_seq']) }} as review_id,
+
+    customer_id,
+    cast(review_date as date) as review_date,
+    cast(rating as integer) as rating,
+    comment as review_text,
+
+    -- Sentiment derived from the star rating (reviews carry no sentiment field)
+    case
+        when rating >= 4 then 'Positive'
+        when rating = 3 then 'Neutral'
+        when rating <= 2 then 'Negative'
+        else 'Unknown'
+    end as sentiment,
+
+    -- Metadata
     current_timestamp as dbt_loaded_at
-from {{ source('churn_raw', 'customer_reviews') }}
+from source_data
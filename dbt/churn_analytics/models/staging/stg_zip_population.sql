@@ -7,6 +7,7 @@
 
 select
     zip as zip_code,
+    state_id as state_code,
     population,
     current_timestamp as dbt_loaded_at
     
@@ -1,7 +1,12 @@
+import os
+import sys
 import duckdb
 import pandas as pd
 from pymongo import MongoClient
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from observability.instrumentation import BatchTimer
+
 print("🍃 MongoDB → DuckDB Migration\n")
 print("=" * 50)
 
@@ -38,8 +43,11 @@ try:
         print(f"      First row: {reviews_df.iloc[0].to_dict()}\n")
         
         # تحميل في DuckDB
-        conn.execute("DROP TABLE IF EXISTS customer_reviews")
-        conn.execute("CREATE TABLE customer_reviews AS SELECT * FROM reviews_df")
+        with BatchTimer("mongo", "customer_reviews") as batch:
+            conn.execute("DROP TABLE IF EXISTS customer_reviews")
+            conn.execute("CREATE TABLE customer_reviews AS SELECT * FROM reviews_df")
+            batch.rows = len(reviews_df)
+            batch.memory_bytes = int(reviews_df.memory_usage(deep=True).sum())
         print(f"   ✅ Loaded {len(reviews_df):,} rows\n")
         
         # 5️⃣ عرض الملخص
@@ -2,6 +2,10 @@ import duckdb
 import mysql.connector
 import pandas as pd
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from observability.instrumentation import BatchTimer
 
 print("🐬 MySQL → DuckDB Migration\n")
 print("=" * 50)
@@ -26,23 +30,32 @@ try:
     
     # 3️⃣ استيراد customer_churn_data
     print("📥 Migrating customer_churn_data...")
-    churn_df = pd.read_sql("SELECT * FROM customer_churn_data", mysql_conn)
-    conn.execute("DROP TABLE IF EXISTS customer_churn_data")
-    conn.execute("CREATE TABLE customer_churn_data AS SELECT * FROM churn_df")
+    with BatchTimer("mysql", "customer_churn_data") as batch:
+        churn_df = pd.read_sql("SELECT * FROM customer_churn_data", mysql_conn)
+        conn.execute("DROP TABLE IF EXISTS customer_churn_data")
+        conn.execute("CREATE TABLE customer_churn_data AS SELECT * FROM churn_df")
+        batch.rows = len(churn_df)
+        batch.memory_bytes = int(churn_df.memory_usage(deep=True).sum())
     print(f"   ✅ Loaded {len(churn_df):,} rows\n")
     
     # 4️⃣ استيراد customer_location
     print("📥 Migrating customer_location...")
-    location_df = pd.read_sql("SELECT * FROM customer_location", mysql_conn)
-    conn.execute("DROP TABLE IF EXISTS customer_location")
-    conn.execute("CREATE TABLE customer_location AS SELECT * FROM location_df")
+    with BatchTimer("mysql", "customer_location") as batch:
+        location_df = pd.read_sql("SELECT * FROM customer_location", mysql_conn)
+        conn.execute("DROP TABLE IF EXISTS customer_location")
+        conn.execute("CREATE TABLE customer_location AS SELECT * FROM location_df")
+        batch.rows = len(location_df)
+        batch.memory_bytes = int(location_df.memory_usage(deep=True).sum())
     print(f"   ✅ Loaded {len(location_df):,} rows\n")
     
     # 5️⃣ استيراد zip_population
     print("📥 Migrating zip_population...")
-    zip_df = pd.read_sql("SELECT * FROM zip_population", mysql_conn)
-    conn.execute("DROP TABLE IF EXISTS zip_population")
-    conn.execute("CREATE TABLE zip_population AS SELECT * FROM zip_df")
+    with BatchTimer("mysql", "zip_population") as batch:
+        zip_df = pd.read_sql("SELECT * FROM zip_population", mysql_conn)
+        conn.execute("DROP TABLE IF EXISTS zip_population")
+        conn.execute("CREATE TABLE zip_population AS SELECT * FROM zip_df")
+        batch.rows = len(zip_df)
+        batch.memory_bytes = int(zip_df.memory_usage(deep=True).sum())
     print(f"   ✅ Loaded {len(zip_df):,} rows\n")
     
     mysql_conn.close()
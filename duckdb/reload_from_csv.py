@@ -1,50 +1,104 @@
+import os
+import sys
 import duckdb
 import pandas as pd
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from observability.instrumentation import BatchTimer, log_event
+from validation.chunk_validation import ChunkValidator
+
 print("🔄 Reloading DuckDB from CSV files\n")
 
 conn = duckdb.connect('churn_warehouse.duckdb')
 
+# Rows rejected by pre-load validation (see validation/chunk_validation.py)
+conn.execute("""
+    CREATE TABLE IF NOT EXISTS load_quarantine (
+        source_table VARCHAR,
+        batch_id INTEGER,
+        source_row BIGINT,
+        reasons VARCHAR,
+        payload VARCHAR,
+        quarantined_at TIMESTAMP DEFAULT current_timestamp
+    )
+""")
+
+
+def validate(df, table):
+    """Vectorized validation in one pass; bad rows go to load_quarantine, good rows are returned."""
+    valid, rejected, stats = ChunkValidator(table).validate(df)
+    conn.execute("DELETE FROM load_quarantine WHERE source_table = ?", [table])
+    if len(rejected):
+        conn.execute("""
+            INSERT INTO load_quarantine (source_table, batch_id, source_row, reasons, payload)
+            SELECT source_table, batch_id, source_row, reasons, payload FROM rejected
+        """)
+        print(f"  ⚠️ Quarantined {len(rejected)} rows: {stats['failures']}")
+    log_event("validation_batch", **stats)
+    return valid, stats
+
 # 1. Customer Churn Data
 print("📊 Loading Telco-Customer-Churn.csv...")
-churn_df = pd.read_csv('../sql/data/Telco-Customer-Churn.csv', sep=';')
-print(f"  Shape: {churn_df.shape}")
-print(f"  Columns: {list(churn_df.columns)}")
-print(f"  First 2 rows:\n{churn_df.head(2)}\n")
-
-conn.execute("DROP TABLE IF EXISTS customer_churn_data")
-conn.execute("CREATE TABLE customer_churn_data AS SELECT * FROM churn_df")
+with BatchTimer("csv", "customer_churn_data") as batch:
+    churn_df = pd.read_csv('../sql/data/Telco-Customer-Churn.csv', sep=';')
+    churn_df, stats = validate(churn_df, 'customer_churn_data')
+    batch.errors = stats['quarantined']
+    print(f"  Shape: {churn_df.shape}")
+    print(f"  Columns: {list(churn_df.columns)}")
+    print(f"  First 2 rows:\n{churn_df.head(2)}\n")
+
+    conn.execute("DROP TABLE IF EXISTS customer_churn_data")
+    conn.execute("CREATE TABLE customer_churn_data AS SELECT * FROM churn_df")
+    batch.rows = len(churn_df)
+    batch.bytes = os.path.getsize('../sql/data/Telco-Customer-Churn.csv')
+    batch.memory_bytes = int(churn_df.memory_usage(deep=True).sum())
 
 # 2. Customer Location
 print("📍 Loading customer_location.csv...")
-location_df = pd.read_csv('../sql/data/customer_location.csv')
-print(f"  Shape: {location_df.shape}")
-print(f"  Columns: {list(location_df.columns)}\n")
-
-conn.execute("DROP TABLE IF EXISTS customer_location")
-conn.execute("CREATE TABLE customer_location AS SELECT * FROM location_df")
+with BatchTimer("csv", "customer_location") as batch:
+    location_df = pd.read_csv('../sql/data/customer_location.csv')
+    location_df, stats = validate(location_df, 'customer_location')
+    batch.errors = stats['quarantined']
+    print(f"  Shape: {location_df.shape}")
+    print(f"  Columns: {list(location_df.columns)}\n")
+
+    conn.execute("DROP TABLE IF EXISTS customer_location")
+    conn.execute("CREATE TABLE customer_location AS SELECT * FROM location_df")
+    batch.rows = len(location_df)
+    batch.bytes = os.path.getsize('../sql/data/customer_location.csv')
+    batch.memory_bytes = int(location_df.memory_usage(deep=True).sum())
 
 # 3. Zip Population
 print("🌍 Loading zip_population.csv...")
-zip_df = pd.read_csv('../sql/data/zip_population.csv', sep=';')
-print(f"  Shape: {zip_df.shape}\n")
-
-conn.execute("DROP TABLE IF EXISTS zip_population")
-conn.execute("CREATE TABLE zip_population AS SELECT * FROM zip_df")
+with BatchTimer("csv", "zip_population") as batch:
+    zip_df = pd.read_csv('../sql/data/zip_population.csv', sep=';')
+    zip_df, stats = validate(zip_df, 'zip_population')
+    batch.errors = stats['quarantined']
+    print(f"  Shape: {zip_df.shape}\n")
+
+    conn.execute("DROP TABLE IF EXISTS zip_population")
+    conn.execute("CREATE TABLE zip_population AS SELECT * FROM zip_df")
+    batch.rows = len(zip_df)
+    batch.bytes = os.path.getsize('../sql/data/zip_population.csv')
+    batch.memory_bytes = int(zip_df.memory_usage(deep=True).sum())
 
 # 4. Customer Reviews
 print("📝 Loading customer_reviews.jsonl...")
 import json
-reviews = []
-with open('../mongo/data/customer_reviews.jsonl', 'r') as f:
-    for line in f:
-        reviews.append(json.loads(line))
-
-reviews_df = pd.DataFrame(reviews)
-print(f"  Shape: {reviews_df.shape}\n")
-
-conn.execute("DROP TABLE IF EXISTS customer_reviews")
-conn.execute("CREATE TABLE customer_reviews AS SELECT * FROM reviews_df")
+with BatchTimer("jsonl", "customer_reviews") as batch:
+    reviews = []
+    with open('../mongo/data/customer_reviews.jsonl', 'r') as f:
+        for line in f:
+            reviews.append(json.loads(line))
+
+    reviews_df = pd.DataFrame(reviews)
+    print(f"  Shape: {reviews_df.shape}\n")
+
+    conn.execute("DROP TABLE IF EXISTS customer_reviews")
+    conn.execute("CREATE TABLE customer_reviews AS SELECT * FROM reviews_df")
+    batch.rows = len(reviews_df)
+    batch.bytes = os.path.getsize('../mongo/data/customer_reviews.jsonl')
+    batch.memory_bytes = int(reviews_df.memory_usage(deep=True).sum())
 
 # 5. Verification
 print("="*50)
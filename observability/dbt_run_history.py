@@ -0,0 +1,289 @@
+"""
+dbt run-performance history, regression detection and critical-path report.
+
+Usage (from the repo root, after a `dbt run`):
+    python observability/dbt_run_history.py record
+    python observability/dbt_run_history.py report
+
+`record` parses target/run_results.json + target/manifest.json and appends one
+row per model to `telemetry.dbt_model_runs` in the DuckDB warehouse, together
+with its rolling baseline (median of the previous successful runs) and a
+regression flag.
+
+`report` walks the staging -> intermediate -> marts graph from the manifest,
+weights each model by its latest recorded runtime and prints the critical path
+(the dependency chain that bounds total run time).
+"""
+import argparse
+import json
+import os
+import sys
+from graphlib import TopologicalSorter
+
+import duckdb
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from observability.instrumentation import log_event
+
+# -----------------------------
+# Configuration
+# -----------------------------
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DBT_PROJECT_DIR = os.getenv("DBT_PROJECT_DIR", os.path.join(REPO_ROOT, "dbt", "churn_analytics"))
+DUCKDB_PATH = os.getenv("DUCKDB_PATH", os.path.join(REPO_ROOT, "duckdb", "churn_warehouse.duckdb"))
+
+TELEMETRY_TABLE = "telemetry.dbt_model_runs"
+
+BASELINE_WINDOW = 10          # previous successful runs used for the rolling baseline
+MIN_BASELINE_RUNS = 3         # don't flag a model until it has this much history
+REGRESSION_THRESHOLD = 0.5    # flag when runtime > baseline * (1 + threshold)
+MIN_REGRESSION_SECONDS = 0.5  # ... and the absolute slowdown exceeds this (ignores noise)
+
+
+# -----------------------------
+# Artifacts
+# -----------------------------
+def load_artifacts(target_dir):
+    with open(os.path.join(target_dir, "run_results.json"), encoding="utf-8") as f:
+        run_results = json.load(f)
+    with open(os.path.join(target_dir, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    return run_results, manifest
+
+
+def model_layer(node):
+    """staging / intermediate / marts, taken from the model's folder in the fqn."""
+    fqn = node.get("fqn", [])
+    return fqn[1] if len(fqn) > 2 else "root"
+
+
+def parse_model_runs(run_results, manifest):
+    """One dict per executed model, joined with its manifest metadata."""
+    metadata = run_results.get("metadata", {})
+    invocation_id = metadata.get("invocation_id")
+    generated_at = metadata.get("generated_at")
+    nodes = manifest.get("nodes", {})
+
+    runs = []
+    for result in run_results.get("results", []):
+        unique_id = result["unique_id"]
+        node = nodes.get(unique_id, {})
+        if node.get("resource_type", "model") != "model":
+            continue
+        adapter_response = result.get("adapter_response") or {}
+        runs.append({
+            'invocation_id': invocation_id,
+            'generated_at': generated_at,
+            'unique_id': unique_id,
+            'model_name': node.get("name", unique_id.split(".")[-1]),
+            'layer': model_layer(node),
+            'materialization': node.get("config", {}).get("materialized"),
+            'status': result.get("status"),
+            'execution_time': float(result.get("execution_time") or 0.0),
+            'rows_affected': adapter_response.get("rows_affected"),
+            'thread_id': result.get("thread_id"),
+        })
+    return runs
+
+
+# -----------------------------
+# Telemetry table
+# -----------------------------
+def ensure_table(con):
+    con.execute("CREATE SCHEMA IF NOT EXISTS telemetry")
+    con.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TELEMETRY_TABLE} (
+            invocation_id     VARCHAR,
+            generated_at      TIMESTAMP,
+            unique_id         VARCHAR,
+            model_name        VARCHAR,
+            layer             VARCHAR,
+            materialization   VARCHAR,
+            status            VARCHAR,
+            execution_time    DOUBLE,
+            rows_affected     BIGINT,
+            thread_id         VARCHAR,
+            baseline_seconds  DOUBLE,
+            baseline_runs     INTEGER,
+            is_regression     BOOLEAN,
+            recorded_at       TIMESTAMP DEFAULT current_timestamp,
+            PRIMARY KEY (invocation_id, unique_id)
+        )
+    """)
+
+
+def rolling_baselines(con, unique_ids, before, window=BASELINE_WINDOW):
+    """{unique_id: (median_seconds, n_runs)} over the last `window` successful runs before `before`."""
+    if not unique_ids:
+        return {}
+    rows = con.execute(f"""
+        WITH history AS (
+            SELECT
+                unique_id,
+                execution_time,
+                row_number() OVER (PARTITION BY unique_id ORDER BY generated_at DESC) AS rn
+            FROM {TELEMETRY_TABLE}
+            WHERE status = 'success'
+              AND generated_at < CAST(? AS TIMESTAMP)
+              AND unique_id IN (SELECT unnest(?))
+        )
+        SELECT unique_id, median(execution_time), count(*)
+        FROM history
+        WHERE rn <= ?
+        GROUP BY unique_id
+    """, [before, list(unique_ids), window]).fetchall()
+    return {unique_id: (baseline, n) for unique_id, baseline, n in rows}
+
+
+def is_regression(execution_time, baseline, n_runs, threshold=REGRESSION_THRESHOLD):
+    if baseline is None or n_runs < MIN_BASELINE_RUNS:
+        return False
+    return (execution_time > baseline * (1 + threshold)
+            and execution_time - baseline > MIN_REGRESSION_SECONDS)
+
+
+def record(con, runs, threshold=REGRESSION_THRESHOLD):
+    """Insert `runs` with their baseline; returns the runs flagged as regressions."""
+    ensure_table(con)
+    if not runs:
+        return []
+
+    baselines = rolling_baselines(con, {r['unique_id'] for r in runs}, runs[0]['generated_at'])
+    regressions = []
+    for run in runs:
+        baseline, n_runs = baselines.get(run['unique_id'], (None, 0))
+        run['baseline_seconds'] = baseline
+        run['baseline_runs'] = n_runs
+        run['is_regression'] = run['status'] == 'success' and is_regression(
+            run['execution_time'], baseline, n_runs, threshold)
+        if run['is_regression']:
+            regressions.append(run)
+
+    columns = list(runs[0].keys())
+    con.executemany(
+        f"INSERT OR REPLACE INTO {TELEMETRY_TABLE} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)})",
+        [[run[c] for c in columns] for run in runs],
+    )
+    return regressions
+
+
+# -----------------------------
+# Critical path
+# -----------------------------
+def model_graph(manifest):
+    """{model unique_id: set(upstream model unique_ids)} for this project's models."""
+    nodes = {
+        uid: node for uid, node in manifest.get("nodes", {}).items()
+        if node.get("resource_type") == "model"
+    }
+    return nodes, {
+        uid: {dep for dep in node.get("depends_on", {}).get("nodes", []) if dep in nodes}
+        for uid, node in nodes.items()
+    }
+
+
+def latest_runtimes(con):
+    """Most recent successful execution time per model, across all invocations."""
+    rows = con.execute(f"""
+        SELECT unique_id, arg_max(execution_time, generated_at)
+        FROM {TELEMETRY_TABLE}
+        WHERE status = 'success'
+        GROUP BY unique_id
+    """).fetchall()
+    return dict(rows)
+
+
+def critical_path(graph, runtimes):
+    """Longest runtime-weighted chain through the DAG: (total_seconds, [unique_id, ...])."""
+    finish = {}
+    previous = {}
+    for uid in TopologicalSorter(graph).static_order():
+        upstream = max(graph.get(uid, ()), key=lambda dep: finish[dep], default=None)
+        finish[uid] = runtimes.get(uid, 0.0) + (finish[upstream] if upstream else 0.0)
+        previous[uid] = upstream
+
+    if not finish:
+        return 0.0, []
+    end = max(finish, key=finish.get)
+    path = []
+    while end is not None:
+        path.append(end)
+        end = previous[end]
+    return finish[path[0]], list(reversed(path))
+
+
+def print_report(nodes, graph, runtimes):
+    total, path = critical_path(graph, runtimes)
+    all_models = sum(runtimes.get(uid, 0.0) for uid in graph)
+
+    print("=" * 60)
+    print("⏱️  dbt critical path (latest successful runtimes)")
+    print("=" * 60)
+    for uid in path:
+        node = nodes[uid]
+        seconds = runtimes.get(uid, 0.0)
+        share = seconds / total * 100 if total else 0
+        print(f"  {model_layer(node):13s} {node['name']:32s} {seconds:8.2f}s  {share:5.1f}%")
+    print("-" * 60)
+    print(f"  Critical path total: {total:.2f}s  (all models serial: {all_models:.2f}s)")
+
+    print("\n📊 Runtime by layer:")
+    layers = {}
+    for uid in graph:
+        layer = model_layer(nodes[uid])
+        layers[layer] = layers.get(layer, 0.0) + runtimes.get(uid, 0.0)
+    for layer, seconds in sorted(layers.items(), key=lambda kv: -kv[1]):
+        print(f"  {layer:13s} {seconds:8.2f}s")
+    print("=" * 60)
+
+    log_event(
+        "dbt_critical_path",
+        total_seconds=round(total, 3),
+        serial_seconds=round(all_models, 3),
+        path=[{'model': nodes[uid]['name'], 'seconds': runtimes.get(uid, 0.0)} for uid in path],
+        layers=layers,
+    )
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("command", choices=["record", "report"])
+    parser.add_argument("--target-dir", default=os.path.join(DBT_PROJECT_DIR, "target"))
+    parser.add_argument("--database", default=DUCKDB_PATH)
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="relative slowdown vs. baseline that counts as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="exit with status 1 when any model regressed")
+    args = parser.parse_args(argv)
+
+    run_results, manifest = load_artifacts(args.target_dir)
+    con = duckdb.connect(args.database)
+    try:
+        if args.command == "record":
+            runs = parse_model_runs(run_results, manifest)
+            regressions = record(con, runs, args.threshold)
+            log_event("dbt_run_recorded",
+                      invocation_id=run_results.get("metadata", {}).get("invocation_id"),
+                      models=len(runs), regressions=len(regressions))
+            for run in regressions:
+                log_event("dbt_model_regression", model=run['model_name'], layer=run['layer'],
+                          seconds=round(run['execution_time'], 3),
+                          baseline_seconds=round(run['baseline_seconds'], 3),
+                          baseline_runs=run['baseline_runs'])
+            if regressions and args.fail_on_regression:
+                return 1
+        else:
+            ensure_table(con)
+            nodes, graph = model_graph(manifest)
+            print_report(nodes, graph, latest_runtimes(con))
+    finally:
+        con.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""
+Lightweight instrumentation for the dashboard and the ingestion scripts.
+
+Records timing spans and counters in-process and exposes them two ways:
+  - Prometheus text format, served on the Dash server's `/metrics` route
+  - structured JSON log lines, printed by the ingestion scripts
+
+Only the standard library is used so every script can import it.
+"""
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# -----------------------------
+# Configuration
+# -----------------------------
+METRIC_PREFIX = "churn"
+
+# Histogram buckets (seconds) - from a fast DuckDB lookup up to a full table reload
+SPAN_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+# -----------------------------
+# Metrics registry
+# -----------------------------
+class MetricsRegistry:
+    """Thread-safe store of span histograms and counters."""
+
+    def __init__(self, prefix=METRIC_PREFIX, buckets=SPAN_BUCKETS):
+        self.prefix = prefix
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._spans = {}
+        self._counters = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def observe(self, name, seconds, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            entry = self._spans.get(key)
+            if entry is None:
+                entry = {'count': 0, 'sum': 0.0, 'max': 0.0, 'buckets': [0] * len(self.buckets)}
+                self._spans[key] = entry
+            entry['count'] += 1
+            entry['sum'] += seconds
+            entry['max'] = max(entry['max'], seconds)
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    entry['buckets'][i] += 1
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    @contextmanager
+    def span(self, name, **labels):
+        """Time the enclosed block and record it under `name` with `labels`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self):
+        with self._lock:
+            self._spans.clear()
+            self._counters.clear()
+
+    # -----------------------------
+    # Exporters
+    # -----------------------------
+    def snapshot(self):
+        """Plain-dict copy of every span and counter (used for JSON output)."""
+        with self._lock:
+            spans = [
+                {'name': name, 'labels': dict(labels), 'count': e['count'],
+                 'sum': round(e['sum'], 6), 'max': round(e['max'], 6)}
+                for (name, labels), e in self._spans.items()
+            ]
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in self._counters.items()
+            ]
+        return {'spans': spans, 'counters': counters}
+
+    def render_prometheus(self):
+        """Render all metrics in the Prometheus text exposition format (0.0.4)."""
+        lines = []
+        with self._lock:
+            spans = sorted(self._spans.items())
+            counters = sorted(self._counters.items())
+
+        seen = set()
+        for (name, labels), e in spans:
+            metric = f"{self.prefix}_{name}_seconds"
+            if metric not in seen:
+                lines.append(f"# TYPE {metric} histogram")
+                seen.add(metric)
+            for bound, hits in zip(self.buckets, e['buckets']):
+                lines.append(f"{metric}_bucket{_labels(labels, ('le', _fmt(bound)))} {hits}")
+            lines.append(f"{metric}_bucket{_labels(labels, ('le', '+Inf'))} {e['count']}")
+            lines.append(f"{metric}_sum{_labels(labels)} {_fmt(e['sum'])}")
+            lines.append(f"{metric}_count{_labels(labels)} {e['count']}")
+
+        for (name, labels), value in counters:
+            metric = f"{self.prefix}_{name}_total"
+            if metric not in seen:
+                lines.append(f"# TYPE {metric} counter")
+                seen.add(metric)
+            lines.append(f"{metric}{_labels(labels)} {_fmt(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _fmt(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels, extra=None):
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+# Process-wide default registry
+REGISTRY = MetricsRegistry()
+span = REGISTRY.span
+inc = REGISTRY.inc
+
+
+# -----------------------------
+# DuckDB queries
+# -----------------------------
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def sql_fingerprint(sql):
+    """Stable short id for a query shape: literals and whitespace are normalised away."""
+    normalised = _STRING_LITERAL.sub("?", sql)
+    normalised = _NUMBER_LITERAL.sub("?", normalised)
+    normalised = _WHITESPACE.sub(" ", normalised).strip().lower()
+    return hashlib.sha1(normalised.encode("utf-8")).hexdigest()[:12]
+
+
+def timed_query(con, sql, params=None, name="query", registry=None):
+    """Execute `sql` on a DuckDB connection inside a `duckdb_query` span.
+
+    Returns the connection's result so callers can chain `.fetch_df()` etc.
+    The span covers execution only; time spent fetching is the caller's.
+    """
+    registry = registry or REGISTRY
+    fingerprint = sql_fingerprint(sql)
+    try:
+        with registry.span("duckdb_query", query=name, fingerprint=fingerprint):
+            return con.execute(sql, params) if params is not None else con.execute(sql)
+    except Exception:
+        registry.inc("duckdb_query_errors", query=name, fingerprint=fingerprint)
+        raise
+
+
+# -----------------------------
+# Structured logs (ingestion scripts)
+# -----------------------------
+def log_event(event, stream=None, **fields):
+    """Write a single JSON log line with a UTC timestamp."""
+    record = {'ts': datetime.now(timezone.utc).isoformat(timespec='milliseconds'), 'event': event}
+    record.update(fields)
+    print(json.dumps(record, default=str), file=stream or sys.stdout, flush=True)
+
+
+class BatchTimer:
+    """Measure one ingestion batch and report rows/sec, bytes and errors.
+
+    `bytes` is what was read from the source file (0 for database sources);
+    `memory_bytes` is the in-memory size of the loaded DataFrame.
+
+    Usage:
+        with BatchTimer("csv", "customer_churn_data") as batch:
+            ...load...
+            batch.rows = len(df)
+            batch.bytes = os.path.getsize(path)
+            batch.memory_bytes = int(df.memory_usage(deep=True).sum())
+    """
+
+    def __init__(self, source, table, registry=None):
+        self.source = source
+        self.table = table
+        self.registry = registry or REGISTRY
+        self.rows = 0
+        self.bytes = 0
+        self.memory_bytes = 0
+        self.errors = 0
+        self.seconds = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.seconds = time.perf_counter() - self._start
+        if exc_type is not None:
+            self.errors += 1
+        labels = {'source': self.source, 'table': self.table}
+        self.registry.observe("ingest_batch", self.seconds, **labels)
+        self.registry.inc("ingest_rows", self.rows, **labels)
+        self.registry.inc("ingest_bytes", self.bytes, **labels)
+        self.registry.inc("ingest_memory_bytes", self.memory_bytes, **labels)
+        self.registry.inc("ingest_errors", self.errors, **labels)
+        log_event(
+            "ingest_batch",
+            source=self.source,
+            table=self.table,
+            rows=self.rows,
+            bytes=self.bytes,
+            memory_bytes=self.memory_bytes,
+            errors=self.errors,
+            seconds=round(self.seconds, 4),
+            rows_per_sec=round(self.rows / self.seconds, 1) if self.seconds else None,
+            status="error" if exc_type is not None else "ok",
+        )
+        return False
+
+
+# -----------------------------
+# Flask / Dash integration
+# -----------------------------
+def register_metrics_route(server, registry=None, path="/metrics"):
+    """Expose the registry on a Flask app and time every HTTP request.
+
+    Request timing includes Dash's JSON serialisation of callback outputs,
+    which the callback itself cannot see.
+    """
+    from flask import Response, g, request
+
+    registry = registry or REGISTRY
+
+    @server.before_request
+    def _start_timer():
+        g._instrumentation_start = time.perf_counter()
+
+    @server.after_request
+    def _stop_timer(response):
+        start = getattr(g, "_instrumentation_start", None)
+        if start is not None and request.path != path:
+            # Label by route pattern, not raw path, to keep label cardinality bounded
+            route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+            registry.observe("http_request", time.perf_counter() - start,
+                             route=route, method=request.method)
+            registry.inc("http_response_bytes", response.calculate_content_length() or 0,
+                         route=route)
+        return response
+
+    @server.route(path)
+    def _metrics():
+        return Response(registry.render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+    return server
@@ -33,4 +33,14 @@ CREATE TABLE IF NOT EXISTS customer_location (
 CREATE TABLE IF NOT EXISTS zip_population (
     Zip_Code INT PRIMARY KEY,
     Population INT
+);
+
+CREATE TABLE IF NOT EXISTS load_quarantine (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    source_table VARCHAR(64),
+    batch_id INT,
+    source_row BIGINT,
+    reasons VARCHAR(1024),
+    payload TEXT,
+    quarantined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
\ No newline at end of file
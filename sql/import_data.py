@@ -1,6 +1,16 @@
+import json
+import os
+import sys
 import mysql.connector
 import pandas as pd
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from observability.instrumentation import BatchTimer, log_event
+from validation.chunk_validation import ChunkValidator
+
+BATCH_SIZE = 1000
+ER_DUP_ENTRY = 1062
+
 # 1️⃣ Connect to MySQL
 conn = mysql.connector.connect(
     host="localhost",
@@ -10,73 +20,131 @@ conn = mysql.connector.connect(
 )
 cursor = conn.cursor()
 
-# 2️⃣ Load CSV files بالفاصل الصحيح
-print("📂 Loading CSV files...")
+# 2️⃣ Quarantine table (rows rejected by validation or by MySQL)
+cursor.execute("""
+    CREATE TABLE IF NOT EXISTS load_quarantine (
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        source_table VARCHAR(64),
+        batch_id INT,
+        source_row BIGINT,
+        reasons VARCHAR(1024),
+        payload TEXT,
+        quarantined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+""")
 
-churn_df = pd.read_csv("data/Telco-Customer-Churn.csv", sep=';')
-location_df = pd.read_csv("data/customer_location.csv")  # هذا عادي
-zip_df = pd.read_csv("data/zip_population.csv", sep=';')
-
-print(f"✅ Churn data: {len(churn_df)} rows, columns: {list(churn_df.columns[:5])}...")
-print(f"✅ Location data: {len(location_df)} rows")
-print(f"✅ Zip data: {len(zip_df)} rows")
+def quarantine(rows):
+    if len(rows):
+        cursor.executemany(
+            "INSERT INTO load_quarantine (source_table, batch_id, source_row, reasons, payload) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            [tuple(r) for r in rows.itertuples(index=False, name=None)]
+        )
 
 # 3️⃣ Insert data
-def insert_dataframe(df, table, column_mapping=None):
+def insert_rows(df, table, batch_id):
     """
-    column_mapping: dict لتحويل أسماء الأعمدة في CSV لأسماء الأعمدة في الجدول
+    executemany للـ chunk كله؛ لو MySQL رفض الـ batch نرجع row-by-row ونعزل الصفوف الفاشلة
+    بدون IGNORE: أخطاء الـ FK والتحويل بتترفض بدل ما تبقى warnings
+    Returns (inserted, skipped) - skipped = صفوف موجودة أصلاً من run سابق
     """
-    if column_mapping:
-        df = df.rename(columns=column_mapping)
-    
+    if df.empty:
+        return 0, 0
     cols = ",".join([f"`{col}`" for col in df.columns])
     placeholders = ",".join(["%s"] * len(df.columns))
-    sql = f"INSERT IGNORE INTO {table} ({cols}) VALUES ({placeholders})"
-    
-    count = 0
-    errors = 0
-    for i, row in df.iterrows():
+    sql = f"INSERT INTO {table} ({cols}) VALUES ({placeholders})"
+    rows = list(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
+
+    try:
+        cursor.executemany(sql, rows)
+        return len(rows), 0
+    except mysql.connector.Error:
+        conn.rollback()
+
+    inserted = 0
+    skipped = 0
+    failed = []
+    for source_row, row in zip(df.index, rows):
         try:
-            cursor.execute(sql, tuple(row))
-            count += 1
-            if count % 1000 == 0:
-                print(f"   Processed {count} rows...")
+            cursor.execute(sql, row)
+            inserted += 1
+        except mysql.connector.Error as e:
+            if e.errno == ER_DUP_ENTRY:
+                # Loaded by an earlier run (duplicates inside the file are caught by validation)
+                skipped += 1
+                continue
+            payload = json.dumps(dict(zip(df.columns, row)), default=str)
+            failed.append((table, batch_id, int(source_row), f"db_error:{e.msg}", payload))
+    quarantine(pd.DataFrame(failed))
+    return inserted, skipped
+
+
+def load_csv(path, table, read_kwargs=None, prepare=None, column_mapping=None):
+    """
+    يقرأ الـ CSV على chunks، يعمل validation لكل chunk قبل التحميل، ويعزل الصفوف السيئة
+    column_mapping: dict لتحويل أسماء الأعمدة في CSV لأسماء الأعمدة في الجدول
+    """
+    validator = ChunkValidator(table)
+    count = 0
+    quarantined = 0
+    existing = 0
+    with open(path, 'rb') as f:
+        bytes_read = 0
+        for chunk in pd.read_csv(f, chunksize=BATCH_SIZE, **(read_kwargs or {})):
+            with BatchTimer("csv", table) as batch:
+                # Bytes consumed from the file for this chunk (the parser reads ahead, so per-chunk
+                # values are approximate; they add up to the file size)
+                batch.bytes = f.tell() - bytes_read
+                bytes_read = f.tell()
+                batch.memory_bytes = int(chunk.memory_usage(deep=True).sum())
+
+                valid, rejected, stats = validator.validate(chunk)
+                quarantine(rejected)
+                # Commit the rejects first so a rollback in insert_rows can't discard them
+                conn.commit()
+
+                if prepare:
+                    valid = prepare(valid)
+                if column_mapping:
+                    valid = valid.rename(columns=column_mapping)
+
+                inserted, skipped = insert_rows(valid, table, stats['batch_id'])
+                batch.rows = inserted
+                batch.errors = stats['quarantined'] + len(valid) - inserted - skipped
                 conn.commit()
-        except Exception as e:
-            errors += 1
-            if errors <= 3:
-                print(f"❌ Error at row {i}: {e}")
-    
-    conn.commit()
-    print(f"✅ Inserted {count} rows into {table} (errors: {errors})")
+
+            log_event("validation_batch", skipped_existing=skipped, **stats)
+            count += batch.rows
+            quarantined += batch.errors
+            existing += skipped
+            print(f"   Processed {count} rows...")
+
+    print(f"✅ Inserted {count} rows into {table} (quarantined: {quarantined}, already loaded: {existing})")
 
 # 4️⃣ Run the inserts
 print("\n📥 Importing data...\n")
 
-# zip_population - تحويل أسماء الأعمدة
-zip_mapping = {
-    'zip': 'Zip_Code',
-    'population': 'Population'
-}
-# نحتاج فقط العمودين المطلوبين
-zip_df_clean = zip_df[['zip', 'population']].copy()
-insert_dataframe(zip_df_clean, "zip_population", zip_mapping)
-
-# customer_churn_data
-insert_dataframe(churn_df, "customer_churn_data")
-
-# customer_location - تحويل أسماء الأعمدة
-location_mapping = {
-    'customerid': 'customerID',
-    'zip': 'Zip_Code'
-}
-# نختار الأعمدة المطلوبة فقط
-location_df_clean = location_df[['customerid', 'zip']].copy()
-# نضيف Latitude و Longitude كقيم افتراضية (أو يمكن حذف هذه الأعمدة من الجدول)
-location_df_clean['Latitude'] = 0.0
-location_df_clean['Longitude'] = 0.0
-
-insert_dataframe(location_df_clean, "customer_location", location_mapping)
+# zip_population - تحويل أسماء الأعمدة ونحتاج فقط العمودين المطلوبين
+load_csv(
+    "data/zip_population.csv", "zip_population",
+    read_kwargs={'sep': ';'},
+    prepare=lambda df: df[['zip', 'population']],
+    column_mapping={'zip': 'Zip_Code', 'population': 'Population'}
+)
+
+# customer_churn_data (TotalCharges فيها قيم فاضية فنقرأها كنص)
+load_csv(
+    "data/Telco-Customer-Churn.csv", "customer_churn_data",
+    read_kwargs={'sep': ';', 'dtype': {'TotalCharges': str}}
+)
+
+# customer_location - نختار الأعمدة المطلوبة فقط
+# ونضيف Latitude و Longitude كقيم افتراضية (أو يمكن حذف هذه الأعمدة من الجدول)
+load_csv(
+    "data/customer_location.csv", "customer_location",
+    prepare=lambda df: df[['customerid', 'zip']].assign(Latitude=0.0, Longitude=0.0),
+    column_mapping={'customerid': 'customerID', 'zip': 'Zip_Code'}
+)
 
 print("\n✅ Data import completed!")
 
@@ -91,6 +159,9 @@ print(f"   customer_churn_data: {cursor.fetchone()[0]} rows")
 cursor.execute("SELECT COUNT(*) FROM customer_location")
 print(f"   customer_location: {cursor.fetchone()[0]} rows")
 
+cursor.execute("SELECT COUNT(*) FROM load_quarantine")
+print(f"   load_quarantine: {cursor.fetchone()[0]} rows")
+
 # 6️⃣ Close connection
 cursor.close()
 conn.close()
\ No newline at end of file
@@ -0,0 +1,117 @@
+"""
+Tests for validation/chunk_validation.py (ChunkValidator.validate).
+
+Run from the repo root:
+    python -m pytest tests
+"""
+import json
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from validation.chunk_validation import QUARANTINE_COLUMNS, ChunkValidator
+
+
+def churn_chunk(rows, index=None):
+    columns = ['customerID', 'Churn', 'MonthlyCharges', 'TotalCharges']
+    return pd.DataFrame(rows, columns=columns, index=index)
+
+
+def test_valid_chunk_passes_untouched():
+    chunk = churn_chunk([
+        ['0001-A', 'No', '29.85', '29.85'],
+        ['0002-B', 'Yes', '56.95', '1889.5'],
+    ])
+
+    valid, rejected, stats = ChunkValidator('customer_churn_data').validate(chunk)
+
+    assert valid.equals(chunk)
+    assert rejected.empty
+    assert list(rejected.columns) == QUARANTINE_COLUMNS
+    assert stats == {
+        'table': 'customer_churn_data', 'batch_id': 1,
+        'rows': 2, 'valid': 2, 'quarantined': 0, 'failures': {},
+    }
+
+
+def test_duplicates_are_caught_within_and_across_chunks():
+    validator = ChunkValidator('customer_churn_data')
+    first = churn_chunk([
+        ['0001-A', 'No', '29.85', '29.85'],
+        ['0001-A', 'No', '30.00', '30.00'],
+    ])
+    second = churn_chunk([
+        ['0001-A', 'Yes', '29.85', '29.85'],
+        ['0003-C', 'No', '42.30', '1840.75'],
+    ], index=[2, 3])
+
+    valid, rejected, stats = validator.validate(first)
+    assert valid.index.tolist() == [0]
+    assert rejected['source_row'].tolist() == [1]
+    assert stats['failures'] == {'unique:customerID': 1}
+
+    valid, rejected, stats = validator.validate(second)
+    assert valid['customerID'].tolist() == ['0003-C']
+    assert rejected['source_row'].tolist() == [2]
+    assert rejected['batch_id'].tolist() == [2]
+    assert rejected['reasons'].tolist() == ['unique:customerID']
+
+
+def test_rejected_keys_are_not_remembered():
+    # A key quarantined for another reason may still load from a later chunk
+    validator = ChunkValidator('customer_churn_data')
+    validator.validate(churn_chunk([['0001-A', 'Maybe', '29.85', '29.85']]))
+
+    valid, rejected, _ = validator.validate(churn_chunk([['0001-A', 'No', '29.85', '29.85']]))
+
+    assert len(valid) == 1
+    assert rejected.empty
+
+
+def test_blank_total_charges_is_allowed_but_non_numeric_is_not():
+    chunk = churn_chunk([
+        ['0001-A', 'No', '29.85', ' '],
+        ['0002-B', 'No', '29.85', None],
+        ['0003-C', 'No', '29.85', 'n/a'],
+        ['0004-D', 'No', ' ', '10.0'],
+    ])
+
+    valid, rejected, stats = ChunkValidator('customer_churn_data').validate(chunk)
+
+    assert valid['customerID'].tolist() == ['0001-A', '0002-B']
+    assert rejected['source_row'].tolist() == [2, 3]
+    assert rejected['reasons'].tolist() == [
+        'numeric:TotalCharges',
+        'not_null:MonthlyCharges;numeric:MonthlyCharges',
+    ]
+    assert stats['failures'] == {
+        'not_null:MonthlyCharges': 1,
+        'numeric:MonthlyCharges': 1,
+        'numeric:TotalCharges': 1,
+    }
+
+
+def test_missing_column_quarantines_every_row():
+    chunk = churn_chunk([
+        ['0001-A', 'No', '29.85', '29.85'],
+        ['0002-B', 'Yes', '56.95', '1889.5'],
+    ]).drop(columns=['MonthlyCharges'])
+
+    valid, rejected, stats = ChunkValidator('customer_churn_data').validate(chunk)
+
+    assert valid.empty
+    assert stats['quarantined'] == 2
+    assert set(rejected['reasons']) == {'missing_column:MonthlyCharges'}
+
+
+def test_payload_is_json_keyed_by_column():
+    chunk = churn_chunk([['0001-A', 'Unknown', '29.85', '29.85']])
+
+    _, rejected, _ = ChunkValidator('customer_churn_data').validate(chunk)
+
+    assert rejected['reasons'].tolist() == ['accepted_values:Churn']
+    assert json.loads(rejected['payload'].iloc[0]) == {
+        'customerID': '0001-A', 'Churn': 'Unknown', 'MonthlyCharges': '29.85', 'TotalCharges': '29.85',
+    }